@@ -6,6 +6,7 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 SOURCES_DIR = BASE_DIR / "sources"
 CHROMA_DIR = BASE_DIR / "chroma_db"
+LOADER_CACHE_DIR = CHROMA_DIR / "_loader_cache"  # Extracted PDF/DOCX text, keyed by file size+mtime
 OUTPUTS_DIR = BASE_DIR / "outputs"
 GENERATED_DIR = BASE_DIR / "generated"  # Resume & cover letter outputs (MD only)
 RULES_DIR = BASE_DIR / "rules"
@@ -29,3 +30,8 @@ CHUNK_OVERLAP = 100
 
 # Retrieval settings
 DEFAULT_TOP_K = 12
+
+# Vector index defaults (index type and M apply when the index is (re)built)
+DEFAULT_INDEX_TYPE = "flat"
+DEFAULT_HNSW_M = 32
+DEFAULT_HNSW_EF_SEARCH = 64
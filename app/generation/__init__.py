@@ -1,6 +1,6 @@
 """Generation module for resumes and cover letters."""
 from .prompts import CA_LEG_WRITING_RULES, build_resume_prompt, build_cover_letter_prompt
-from .outputs import save_output, get_output_filename, get_output_filename_with_ext, load_history
+from .outputs import save_output, get_output_filename, get_output_filename_with_ext, load_history, get_history_path
 
 __all__ = [
     "CA_LEG_WRITING_RULES",
@@ -10,4 +10,5 @@ __all__ = [
     "get_output_filename",
     "get_output_filename_with_ext",
     "load_history",
+    "get_history_path",
 ]
@@ -1,18 +1,27 @@
 """Save generated outputs to files with versioning and history."""
-import json
+import os
 import re
+from collections import deque
 from datetime import date, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
+import orjson
 
+
+_SLUG_STRIP_RE = re.compile(r"[^\w\s-]")
+_SLUG_SEP_RE = re.compile(r"[-\s]+")
+
+
+@lru_cache(maxsize=256)
 def _slugify(text: str) -> str:
     """Convert text to a safe filename slug."""
     if not text or not text.strip():
         return "output"
     slug = text.lower().strip()
-    slug = re.sub(r"[^\w\s-]", "", slug)
-    slug = re.sub(r"[-\s]+", "_", slug)
+    slug = _SLUG_STRIP_RE.sub("", slug)
+    slug = _SLUG_SEP_RE.sub("_", slug)
     return slug[:50] or "output"
 
 
@@ -55,33 +64,77 @@ def _next_version(outputs_dir: Path, output_type: str, job_title: str, ext: str)
         prefix = "Output"
     base = f"{prefix}-{slug}-{today}"
     safe_ext = (ext or "md").lstrip(".").lower()
-    versions_found = []
-    if (outputs_dir / f"{base}.{safe_ext}").exists():
-        versions_found.append(1)
-    for p in outputs_dir.glob(f"{base}-v*.{safe_ext}"):
-        try:
-            v = int(p.stem.split("-v")[-1])
-            versions_found.append(v)
-        except ValueError:
-            pass
-    return max(versions_found) + 1 if versions_found else 1
+    # One directory read instead of an exists() stat plus a glob; the unversioned
+    # file counts as v1.
+    version_re = re.compile(rf"^{re.escape(base)}(?:-v(\d+))?\.{re.escape(safe_ext)}$")
+    latest = 0
+    try:
+        with os.scandir(outputs_dir) as it:
+            for entry in it:
+                if not entry.name.startswith(base):
+                    continue
+                m = version_re.match(entry.name)
+                if m:
+                    latest = max(latest, int(m.group(1)) if m.group(1) else 1)
+    except FileNotFoundError:
+        pass
+    return latest + 1
+
+
+_HISTORY_LIMIT = 100
+# Rewrite history.jsonl down to the last _HISTORY_LIMIT entries once it grows past this.
+_HISTORY_COMPACT_BYTES = 256 * 1024
 
 
 def get_history_path(outputs_dir: Path) -> Path:
-    """Path to generation history JSON."""
+    """Path to generation history (NDJSON, oldest entry first)."""
+    return Path(outputs_dir) / "history.jsonl"
+
+
+def _get_legacy_history_path(outputs_dir: Path) -> Path:
+    """Path to the pre-NDJSON history file (a single JSON list, newest first)."""
     return Path(outputs_dir) / "history.json"
 
 
+def _load_legacy_history(outputs_dir: Path) -> list[dict]:
+    path = _get_legacy_history_path(outputs_dir)
+    if not path.exists():
+        return []
+    try:
+        return orjson.loads(path.read_bytes())
+    except Exception:
+        return []
+
+
 def load_history(outputs_dir: Path) -> list[dict]:
-    """Load generation history."""
+    """Load generation history, newest first (at most the last 100 entries)."""
     path = get_history_path(outputs_dir)
     if not path.exists():
-        return []
+        return _load_legacy_history(outputs_dir)[:_HISTORY_LIMIT]
+    history: list[dict] = []
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            for line in deque(f, maxlen=_HISTORY_LIMIT):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    history.append(orjson.loads(line))
+                except ValueError:
+                    continue
     except Exception:
         return []
+    history.reverse()
+    return history
+
+
+def _compact_history(path: Path, outputs_dir: Path) -> None:
+    """Trim history.jsonl to the last _HISTORY_LIMIT entries."""
+    entries = list(reversed(load_history(outputs_dir)))
+    tmp_path = path.with_suffix(".jsonl.tmp")
+    with open(tmp_path, "wb") as f:
+        f.writelines(orjson.dumps(e) + b"\n" for e in entries)
+    os.replace(tmp_path, path)
 
 
 def append_to_history(
@@ -92,7 +145,7 @@ def append_to_history(
 ) -> None:
     """Append an entry to generation history."""
     outputs_dir = Path(outputs_dir)
-    history = load_history(outputs_dir)
+    path = get_history_path(outputs_dir)
     entry = {
         "timestamp": datetime.now().isoformat(),
         "type": output_type,
@@ -100,12 +153,15 @@ def append_to_history(
         "filepath": str(filepath),
         "filename": filepath.name,
     }
-    history.insert(0, entry)
-    # Keep last 100 entries
-    history = history[:100]
-    path = get_history_path(outputs_dir)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(history, f, indent=0)
+    lines = []
+    if not path.exists():
+        # Carry over entries from the old history.json on first append
+        lines.extend(orjson.dumps(e) + b"\n" for e in reversed(_load_legacy_history(outputs_dir)[:_HISTORY_LIMIT]))
+    lines.append(orjson.dumps(entry) + b"\n")
+    with open(path, "ab") as f:
+        f.writelines(lines)
+    if path.stat().st_size > _HISTORY_COMPACT_BYTES:
+        _compact_history(path, outputs_dir)
 
 
 def save_output(
@@ -55,15 +55,16 @@ def build_resume_prompt(
     my_address: str = "",
 ) -> tuple[str, str]:
     """Build system and user prompts for resume generation."""
+    name, address, phone, email = my_name.strip(), my_address.strip(), my_phone.strip(), my_email.strip()
     contact_lines = []
-    if my_name.strip():
-        contact_lines.append(f"Name: {my_name.strip()}")
-    if my_address.strip():
-        contact_lines.append(f"Address: {my_address.strip()}")
-    if my_phone.strip():
-        contact_lines.append(f"Phone: {my_phone.strip()}")
-    if my_email.strip():
-        contact_lines.append(f"Email: {my_email.strip()}")
+    if name:
+        contact_lines.append(f"Name: {name}")
+    if address:
+        contact_lines.append(f"Address: {address}")
+    if phone:
+        contact_lines.append(f"Phone: {phone}")
+    if email:
+        contact_lines.append(f"Email: {email}")
 
     contact_block = ""
     if contact_lines:
@@ -96,17 +97,21 @@ def build_cover_letter_prompt(
     my_address: str = "",
 ) -> tuple[str, str]:
     """Build system and user prompts for cover letter generation."""
+    title, manager, org = job_title.strip(), hiring_manager_name.strip(), contact_org.strip()
+    to_email, to_phone = contact_email.strip(), contact_phone.strip()
+    name, address, phone, email = my_name.strip(), my_address.strip(), my_phone.strip(), my_email.strip()
+
     recipient_lines = []
-    if job_title.strip():
-        recipient_lines.append(f"Job title / Position: {job_title.strip()}")
-    if hiring_manager_name.strip():
-        recipient_lines.append(f"Hiring manager (use for salutation): {hiring_manager_name.strip()}")
-    if contact_org.strip():
-        recipient_lines.append(f"Organization/Office: {contact_org.strip()}")
-    if contact_email.strip():
-        recipient_lines.append(f"Contact email: {contact_email.strip()}")
-    if contact_phone.strip():
-        recipient_lines.append(f"Contact phone: {contact_phone.strip()}")
+    if title:
+        recipient_lines.append(f"Job title / Position: {title}")
+    if manager:
+        recipient_lines.append(f"Hiring manager (use for salutation): {manager}")
+    if org:
+        recipient_lines.append(f"Organization/Office: {org}")
+    if to_email:
+        recipient_lines.append(f"Contact email: {to_email}")
+    if to_phone:
+        recipient_lines.append(f"Contact phone: {to_phone}")
 
     recipient_block = ""
     if recipient_lines:
@@ -118,14 +123,14 @@ def build_cover_letter_prompt(
         )
 
     my_lines = []
-    if my_name.strip():
-        my_lines.append(f"My name: {my_name.strip()}")
-    if my_address.strip():
-        my_lines.append(f"My address: {my_address.strip()}")
-    if my_phone.strip():
-        my_lines.append(f"My phone: {my_phone.strip()}")
-    if my_email.strip():
-        my_lines.append(f"My email: {my_email.strip()}")
+    if name:
+        my_lines.append(f"My name: {name}")
+    if address:
+        my_lines.append(f"My address: {address}")
+    if phone:
+        my_lines.append(f"My phone: {phone}")
+    if email:
+        my_lines.append(f"My email: {email}")
 
     my_block = ""
     if my_lines:
@@ -1,6 +1,6 @@
 """Document ingestion pipeline."""
-from .loaders import load_documents_from_dir, load_uploaded_file
-from .chunker import chunk_documents
-from .vector_store import VectorStore
+from .loaders import load_documents_from_dir, load_uploaded_file, source_file_hashes
+from .chunker import chunk_documents, chunk_documents_fast
+from .vector_store import INDEX_TYPES, VectorStore
 
-__all__ = ["load_documents_from_dir", "load_uploaded_file", "chunk_documents", "VectorStore"]
+__all__ = ["load_documents_from_dir", "load_uploaded_file", "source_file_hashes", "chunk_documents", "chunk_documents_fast", "INDEX_TYPES", "VectorStore"]
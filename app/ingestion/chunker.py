@@ -1,46 +1,173 @@
 """Text chunking for RAG."""
 import re
+from bisect import bisect_left, bisect_right
 from typing import Iterator
 
+try:
+    import numba
+    import numpy as np
+except ImportError:  # optional: chunk_documents_fast falls back to _chunk_spans
+    numba = None
+
 DEFAULT_CHUNK_SIZE = 800
 DEFAULT_CHUNK_OVERLAP = 100
 
+# Break points in order of preference: paragraph, line, sentence, word. Level k
+# matches its own separator or any coarser one, so the last level is every break.
+_SEPARATORS = ("\n\n", "\n", ". ", " ")
+_LEVEL_RES = tuple(
+    re.compile("|".join(re.escape(sep) for sep in _SEPARATORS[: i + 1]))
+    for i in range(len(_SEPARATORS))
+)
 
-def _recursive_split(text: str, separators: list[str], chunk_size: int, overlap: int) -> list[str]:
-    """Split text recursively by separators."""
-    if not text or not text.strip():
-        return []
 
-    if len(text) <= chunk_size:
-        return [text.strip()] if text.strip() else []
-
-    sep = separators[0] if separators else ""
-    if sep:
-        parts = text.split(sep)
-        if len(parts) > 1:
-            chunks = []
-            current = ""
-            for part in parts:
-                piece = part + sep if sep not in ("\n", " ") else part
-                if len(current) + len(piece) <= chunk_size:
-                    current += piece
+def _break_points(text: str) -> tuple[list[int], list[list[int]]]:
+    """Return (all break offsets, offsets per separator level), each sorted ascending.
+
+    An offset is the position just after a separator, i.e. where a chunk may end.
+    Each level is one C-level regex scan with no per-match branching in Python.
+    """
+    levels = [[m.end() for m in level_re.finditer(text)] for level_re in _LEVEL_RES]
+    return levels[-1], levels
+
+
+def _chunk_spans(text: str, chunk_size: int, overlap: int) -> list[tuple[int, int]]:
+    """Compute (start, end) offsets of overlapping chunks in a single forward pass.
+
+    Each chunk ends at the coarsest separator that keeps it within chunk_size and at
+    least half full; text with no usable separator is cut at chunk_size. The next
+    chunk starts at the first break point inside the trailing overlap window.
+    """
+    n = len(text)
+    all_points, levels = _break_points(text)
+    spans: list[tuple[int, int]] = []
+    start = 0
+    while start < n:
+        limit = start + chunk_size
+        if limit >= n:
+            spans.append((start, n))
+            break
+        end = limit
+        for min_end in (start + chunk_size // 2, start):
+            found = False
+            for positions in levels:
+                i = bisect_right(positions, limit) - 1
+                if i >= 0 and positions[i] > min_end:
+                    end = positions[i]
+                    found = True
+                    break
+            if found:
+                break
+        spans.append((start, end))
+
+        next_start = end
+        if overlap > 0:
+            i = bisect_left(all_points, end - overlap)
+            if i < len(all_points) and all_points[i] < end:
+                next_start = all_points[i]
+            else:
+                next_start = end - overlap
+        start = next_start if next_start > start else end
+    return spans
+
+
+if numba is not None:
+    # _SEPARATORS as zero-padded code point rows plus their lengths, for the kernels
+    _SEP_LENS = np.array([len(sep) for sep in _SEPARATORS], dtype=np.int64)
+    _SEP_CODES = np.array(
+        [[ord(c) for c in sep.ljust(int(_SEP_LENS.max()), "\0")] for sep in _SEPARATORS],
+        dtype=np.uint32,
+    )
+
+    @numba.njit(cache=True)
+    def _break_points_kernel(cps, sep_codes, sep_lens):
+        """_break_points over code points: levels flattened, level k is points[bounds[k]:bounds[k + 1]]."""
+        n = len(cps)
+        n_levels = len(sep_lens)
+        bounds = np.zeros(n_levels + 1, dtype=np.int64)
+        found = np.empty(n, dtype=np.int64)
+        points = np.empty(0, dtype=np.int64)
+        for level in range(n_levels):
+            # Leftmost, non-overlapping matches of separators 0..level, tried in order
+            count = 0
+            pos = 0
+            while pos < n:
+                matched = 0
+                for s in range(level + 1):
+                    length = sep_lens[s]
+                    if pos + length <= n:
+                        ok = True
+                        for j in range(length):
+                            if cps[pos + j] != sep_codes[s, j]:
+                                ok = False
+                                break
+                        if ok:
+                            matched = length
+                            break
+                if matched:
+                    pos += matched
+                    found[count] = pos
+                    count += 1
                 else:
-                    if current.strip():
-                        chunks.append(current.strip())
-                    # Overlap
-                    overlap_start = max(0, len(current) - overlap)
-                    current = current[overlap_start:] + piece
-            if current.strip():
-                chunks.append(current.strip())
-            return chunks
-
-    # Fallback: split by character
-    chunks = []
-    for i in range(0, len(text), chunk_size - overlap):
-        chunk = text[i : i + chunk_size]
-        if chunk.strip():
-            chunks.append(chunk.strip())
-    return chunks
+                    pos += 1
+            points = np.concatenate((points, found[:count]))
+            bounds[level + 1] = bounds[level] + count
+        return points, bounds
+
+    @numba.njit(cache=True)
+    def _spans_kernel(n, points, bounds, chunk_size, overlap):
+        """_chunk_spans over the flattened break points from _break_points_kernel."""
+        n_levels = len(bounds) - 1
+        all_points = points[bounds[n_levels - 1] : bounds[n_levels]]
+        out = np.empty((n // max(1, chunk_size - overlap) + 2, 2), dtype=np.int64)
+        count = 0
+        start = 0
+        while start < n:
+            if count == out.shape[0]:
+                grown = np.empty((out.shape[0] * 2, 2), dtype=np.int64)
+                grown[:count] = out[:count]
+                out = grown
+            limit = start + chunk_size
+            if limit >= n:
+                out[count, 0] = start
+                out[count, 1] = n
+                count += 1
+                break
+            end = limit
+            found = False
+            for min_end in (start + chunk_size // 2, start):
+                for k in range(n_levels):
+                    positions = points[bounds[k] : bounds[k + 1]]
+                    i = np.searchsorted(positions, limit, side="right") - 1
+                    if i >= 0 and positions[i] > min_end:
+                        end = positions[i]
+                        found = True
+                        break
+                if found:
+                    break
+            out[count, 0] = start
+            out[count, 1] = end
+            count += 1
+
+            next_start = end
+            if overlap > 0:
+                i = np.searchsorted(all_points, end - overlap, side="left")
+                if i < len(all_points) and all_points[i] < end:
+                    next_start = all_points[i]
+                else:
+                    next_start = end - overlap
+            start = next_start if next_start > start else end
+        return out[:count]
+
+
+def _fast_chunk_spans(text: str, chunk_size: int, overlap: int) -> list[tuple[int, int]]:
+    """Same spans as _chunk_spans, with break points and spans computed by Numba when installed."""
+    if numba is None:
+        return _chunk_spans(text, chunk_size, overlap)
+    # UTF-32 gives one array element per str index
+    cps = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    points, bounds = _break_points_kernel(cps, _SEP_CODES, _SEP_LENS)
+    return list(map(tuple, _spans_kernel(len(cps), points, bounds, chunk_size, overlap).tolist()))
 
 
 def chunk_text(
@@ -49,8 +176,18 @@ def chunk_text(
     overlap: int = DEFAULT_CHUNK_OVERLAP,
 ) -> list[str]:
     """Split text into overlapping chunks, respecting paragraph boundaries."""
-    separators = ["\n\n", "\n", ". ", " ", ""]
-    return _recursive_split(text, separators, chunk_size, overlap)
+    return _chunks_from_spans(text, chunk_size, overlap, _chunk_spans)
+
+
+def _chunks_from_spans(text: str, chunk_size: int, overlap: int, spans_fn) -> list[str]:
+    if not text or not text.strip():
+        return []
+    chunks = []
+    for start, end in spans_fn(text, chunk_size, overlap):
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+    return chunks
 
 
 def chunk_documents(
@@ -64,3 +201,16 @@ def chunk_documents(
         for i, chunk in enumerate(chunks):
             chunk_meta = {**metadata, "chunk_index": i}
             yield chunk, chunk_meta
+
+
+def chunk_documents_fast(
+    documents: Iterator[tuple[str, dict]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    overlap: int = DEFAULT_CHUNK_OVERLAP,
+) -> Iterator[tuple[str, dict]]:
+    """chunk_documents with Numba-compiled span offsets (identical output; plain Python without numba)."""
+    for text, metadata in documents:
+        chunks = _chunks_from_spans(text, chunk_size, overlap, _fast_chunk_spans)
+        for i, chunk in enumerate(chunks):
+            chunk_meta = {**metadata, "chunk_index": i}
+            yield chunk, chunk_meta
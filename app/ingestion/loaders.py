@@ -1,10 +1,10 @@
 """Document loaders for PDF, DOCX, and TXT."""
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
 from pathlib import Path
-from typing import Iterator
-
-from pypdf import PdfReader
-from docx import Document
+from typing import Iterator, Optional
 
 from .sanitizer import sanitize_resume_text
 
@@ -15,10 +15,9 @@ def load_uploaded_file(uploaded_file) -> str:
     suffix = Path(name).suffix.lower()
     data = uploaded_file.getvalue()
     if suffix == ".pdf":
-        reader = PdfReader(BytesIO(data))
-        parts = [p.extract_text() for p in reader.pages if p.extract_text()]
-        return "\n\n".join(parts)
+        return "\n\n".join(_iter_pdf_pages(BytesIO(data)))
     if suffix in (".docx", ".doc"):
+        from docx import Document
         doc = Document(BytesIO(data))
         return "\n".join(p.text for p in doc.paragraphs if p.text.strip())
     if suffix in (".txt", ".md", ".markdown"):
@@ -26,19 +25,28 @@ def load_uploaded_file(uploaded_file) -> str:
     raise ValueError(f"Unsupported file type: {suffix}. Use PDF, DOCX, TXT, or MD.")
 
 
-def _load_pdf(file_path: Path) -> str:
-    """Extract text from a PDF file."""
-    reader = PdfReader(file_path)
-    parts = []
+def _iter_pdf_pages(source) -> Iterator[str]:
+    """Yield the non-empty text of each PDF page (source: path or file-like).
+
+    extract_text() runs once per page. Callers joining the result still hold every
+    page's text at once; the whole document is needed for sanitizing and caching.
+    """
+    from pypdf import PdfReader
+    reader = PdfReader(source)
     for page in reader.pages:
         text = page.extract_text()
         if text:
-            parts.append(text)
-    return "\n\n".join(parts)
+            yield text
+
+
+def _load_pdf(file_path: Path) -> str:
+    """Extract text from a PDF file."""
+    return "\n\n".join(_iter_pdf_pages(file_path))
 
 
 def _load_docx(file_path: Path) -> str:
     """Extract text from a DOCX file."""
+    from docx import Document
     doc = Document(file_path)
     return "\n".join(para.text for para in doc.paragraphs if para.text.strip())
 
@@ -48,17 +56,65 @@ def _load_txt(file_path: Path) -> str:
     return file_path.read_text(encoding="utf-8", errors="replace")
 
 
-def load_document(file_path: Path, doc_type: str) -> tuple[str, dict]:
-    """Load a single document and return (text, metadata)."""
+# Suffix -> loader; also the set of supported file types
+_LOADERS = {
+    ".pdf": _load_pdf,
+    ".docx": _load_docx,
+    ".doc": _load_docx,
+    ".txt": _load_txt,
+    ".md": _load_txt,
+    ".markdown": _load_txt,
+}
+# Slow parsers whose output is worth caching on disk
+_CACHED_SUFFIXES = frozenset({".pdf", ".docx", ".doc"})
+
+# Top-level folder under sources/ -> doc_type
+_FOLDER_TYPE = {"resumes": "resume", "experiences": "experience", "books": "book"}
+
+
+def _cached_extract(file_path: Path, cache_dir: Path, extract) -> str:
+    """Return extracted text from cache_dir, keyed by path, size and mtime; extract on miss."""
+    st = os.stat(file_path)
+    key = hashlib.blake2b(
+        f"{file_path.resolve()}:{st.st_size}:{st.st_mtime_ns}".encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+    cache_path = Path(cache_dir) / f"{key}.txt"
+    try:
+        return cache_path.read_text(encoding="utf-8")
+    except (OSError, UnicodeDecodeError):
+        pass  # Missing or unreadable entry: treat as a miss and re-extract
+    text = extract(file_path)
+    # Write to a temp file and rename, so a crash or full disk mid-write never
+    # leaves a truncated entry that later reads would trust
+    tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path.write_text(text, encoding="utf-8")
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        # Cache is best-effort; extraction already succeeded
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+    return text
+
+
+def load_document(file_path: Path, doc_type: str, cache_dir: Optional[Path] = None) -> tuple[str, dict]:
+    """Load a single document and return (text, metadata).
+
+    If cache_dir is given, PDF/DOCX extractions are cached there and reused while
+    the file's size and mtime are unchanged.
+    """
     suffix = file_path.suffix.lower()
-    if suffix == ".pdf":
-        text = _load_pdf(file_path)
-    elif suffix in (".docx", ".doc"):
-        text = _load_docx(file_path)
-    elif suffix in (".txt", ".md", ".markdown"):
-        text = _load_txt(file_path)
-    else:
+    extract = _LOADERS.get(suffix)
+    if extract is None:
         raise ValueError(f"Unsupported file type: {suffix}")
+    if cache_dir is not None and suffix in _CACHED_SUFFIXES:
+        text = _cached_extract(file_path, cache_dir, extract)
+    else:
+        text = extract(file_path)
 
     metadata = {
         "source": file_path.name,
@@ -73,38 +129,109 @@ def load_document(file_path: Path, doc_type: str) -> tuple[str, dict]:
     return cleaned, metadata
 
 
-def _infer_doc_type(file_path: Path, sources_dir: Path) -> str:
-    """Infer doc_type from folder structure."""
+def _infer_doc_type(file_path: str, sources_dir: str) -> str:
+    """Infer doc_type from folder structure. Both paths are strings under the same resolved root."""
     try:
-        rel = file_path.resolve().relative_to(sources_dir.resolve())
-        parts = rel.parts
-        if len(parts) >= 1:
-            folder = parts[0].lower()
-            if folder == "resumes":
-                return "resume"
-            if folder == "experiences":
-                return "experience"
-            if folder == "books":
-                return "book"
+        rel = os.path.relpath(file_path, sources_dir)
     except ValueError:
-        pass
+        return "experience"
+    parts = rel.split(os.sep, 1)
+    if len(parts) > 1:
+        return _FOLDER_TYPE.get(parts[0].lower(), "experience")
     return "experience"  # default for files in sources/ root
 
 
-def load_documents_from_dir(sources_dir: Path) -> Iterator[tuple[str, dict]]:
-    """Load all supported documents from a directory (recursive)."""
+def _iter_files(root: str) -> Iterator[os.DirEntry]:
+    """Recursively yield file entries under root using scandir's cached type info."""
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        subdirs = []
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file():
+                yield entry
+        stack.extend(reversed(subdirs))
+
+
+def _load_worker(job: tuple[Path, str, Optional[Path]]) -> tuple[Path, Optional[tuple[str, dict]], str]:
+    """Process-pool entry point: load one file, returning (path, result, error)."""
+    file_path, doc_type, cache_dir = job
+    try:
+        return file_path, load_document(file_path, doc_type, cache_dir=cache_dir), ""
+    except Exception as e:
+        return file_path, None, str(e)
+
+
+def _yield_loaded(results) -> Iterator[tuple[str, dict]]:
+    """Yield non-empty documents from _load_worker results, logging failures."""
+    for file_path, loaded, error in results:
+        if error:
+            # Log but continue
+            print(f"Warning: Could not load {file_path}: {error}")
+        elif loaded and loaded[0]:
+            yield loaded
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def source_file_hashes(sources_dir: Path) -> dict[str, str]:
+    """SHA-256 of every supported file under sources_dir, keyed by resolved path.
+
+    Keys match the paths load_documents_from_dir walks, so a subset of them can be
+    passed back as its ``paths`` filter.
+    """
+    sources_dir = Path(sources_dir)
+    if not sources_dir.exists():
+        return {}
+    hashes = {}
+    for entry in _iter_files(os.path.realpath(sources_dir)):
+        if os.path.splitext(entry.name)[1].lower() in _LOADERS:
+            try:
+                hashes[entry.path] = _file_sha256(entry.path)
+            except OSError:
+                continue
+    return hashes
+
+
+def load_documents_from_dir(
+    sources_dir: Path,
+    cache_dir: Optional[Path] = None,
+    max_workers: Optional[int] = None,
+    paths: Optional[set[str]] = None,
+) -> Iterator[tuple[str, dict]]:
+    """Load all supported documents from a directory (recursive). See load_document for cache_dir.
+
+    Files are extracted in parallel worker processes (max_workers defaults to the
+    CPU count; 1 loads serially). Results are yielded in directory-walk order.
+    If paths is given (keys from source_file_hashes), only those files are loaded.
+    """
     sources_dir = Path(sources_dir)
     if not sources_dir.exists():
         return
 
-    supported = {".pdf", ".docx", ".doc", ".txt", ".md", ".markdown"}
-    for file_path in sources_dir.rglob("*"):
-        if file_path.is_file() and file_path.suffix.lower() in supported:
-            doc_type = _infer_doc_type(file_path, sources_dir)
-            try:
-                text, metadata = load_document(file_path, doc_type)
-                if text:
-                    yield text, metadata
-            except Exception as e:
-                # Log but continue
-                print(f"Warning: Could not load {file_path}: {e}")
+    src_resolved = os.path.realpath(sources_dir)
+    jobs = [
+        (Path(entry.path), _infer_doc_type(entry.path, src_resolved), cache_dir)
+        for entry in _iter_files(src_resolved)
+        if os.path.splitext(entry.name)[1].lower() in _LOADERS
+        and (paths is None or entry.path in paths)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(_load_worker, jobs, chunksize=4)
+            yield from _yield_loaded(results)
+    else:
+        yield from _yield_loaded(map(_load_worker, jobs))
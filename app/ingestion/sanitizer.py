@@ -41,54 +41,56 @@ _SECTION_START_HINTS = [
     r"^\s*Skills\s*:\s*$",
 ]
 
+def _line_alternation(patterns: list[str]) -> str:
+    """Join per-line patterns into one alternation whose whitespace never crosses a newline."""
+    return "|".join(f"(?:{p})" for p in patterns).replace(r"\s", r"[^\S\n]")
+
+
+# Compiled once at import. Cut and drop patterns run over the whole text in
+# MULTILINE mode, so each is a single C-level scan instead of a per-line loop.
+_CUT_RE = re.compile(_line_alternation(_CUT_SECTION_HEADERS), re.IGNORECASE | re.MULTILINE)
+_DROP_RE = re.compile(
+    rf"(?:{_line_alternation(_DROP_LINE_PATTERNS)})(?:\n|\Z)", re.IGNORECASE | re.MULTILINE
+)
+_SEC_RE = re.compile(_line_alternation(_SECTION_START_HINTS), re.IGNORECASE)
+_BOLD_NAME_RE = re.compile(r"^\s*\*\*[^*]{3,}\*\*\s*$")
+# Every boundary str.splitlines() honours besides "\n" ("\r\n" is folded first)
+_LINE_BREAK_RE = re.compile("[\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029]")
+_TRAILING_WS_RE = re.compile(r"[^\S\n]+$", re.MULTILINE)
+_BLANK_RUN_RE = re.compile(r"\n{4,}")
+
 
 def sanitize_resume_text(text: str) -> str:
     """Return a cleaned resume text suitable for chunking/retrieval."""
     if not text:
         return ""
 
-    lines = text.splitlines()
+    text = _LINE_BREAK_RE.sub("\n", text.replace("\r\n", "\n"))
 
     # 1) Cut off everything after known "meta" sections.
-    cut_re = re.compile("|".join(_CUT_SECTION_HEADERS), re.IGNORECASE)
-    kept: list[str] = []
-    for line in lines:
-        if cut_re.match(line or ""):
-            break
-        kept.append(line)
+    m = _CUT_RE.search(text)
+    if m:
+        text = text[: m.start()]
 
     # 2) Drop known meta/application lines.
-    drop_res = [re.compile(p, re.IGNORECASE) for p in _DROP_LINE_PATTERNS]
-    filtered: list[str] = []
-    for line in kept:
-        if any(r.match(line or "") for r in drop_res):
-            continue
-        filtered.append(line)
+    text = _DROP_RE.sub("", text)
 
     # 3) If there is a long preamble, skip down to first likely resume section.
+    head = text.split("\n", 60)[:60]  # only scan first chunk
     start_idx = 0
-    sec_res = [re.compile(p, re.IGNORECASE) for p in _SECTION_START_HINTS]
-    for i, line in enumerate(filtered[:60]):  # only scan first chunk
-        if any(r.match(line or "") for r in sec_res):
+    for i, line in enumerate(head):
+        if _SEC_RE.match(line):
             start_idx = max(0, i - 2)
             break
         # Some resumes start with a bold name
-        if re.match(r"^\s*\*\*[^*]{3,}\*\*\s*$", line or ""):
+        if _BOLD_NAME_RE.match(line):
             start_idx = i
             break
-    filtered = filtered[start_idx:]
-
-    # 4) Normalize whitespace: remove excessive blank lines.
-    out: list[str] = []
-    blank_run = 0
-    for line in filtered:
-        if not line.strip():
-            blank_run += 1
-            if blank_run <= 2:
-                out.append("")
-            continue
-        blank_run = 0
-        out.append(line.rstrip())
-
-    return "\n".join(out).strip()
+    if start_idx:
+        text = text[sum(len(line) + 1 for line in head[:start_idx]) :]
+
+    # 4) Normalize whitespace: strip line ends and keep at most two blank lines in a row.
+    text = _TRAILING_WS_RE.sub("", text)
+    text = _BLANK_RUN_RE.sub("\n\n\n", text)
 
+    return text.strip()
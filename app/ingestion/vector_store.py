@@ -1,15 +1,93 @@
 """FAISS vector store with Ollama embeddings (no onnxruntime dependency)."""
-import json
+import hashlib
+import itertools
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 
 import faiss
 import numpy as np
 import ollama
+import orjson
+
+# Supported FAISS index layouts (see VectorStore.__init__)
+INDEX_TYPES = ("flat", "ivfpq", "hnsw")
+
+# FAISS wants ~39 training points per centroid. Each 8-bit PQ subquantizer has 256
+# centroids, so that is the binding constraint (the sqrt(n) coarse lists need far
+# fewer). Until then vectors go into a flat index, which is retrained as IVF-PQ on
+# save once it holds this many.
+_IVFPQ_MIN_TRAIN = 39 * 256
+_IVFPQ_NPROBE = 16
+_HNSW_M = 32
+_HNSW_EF_SEARCH = 64
+
+# Process-wide source of VectorStore.generation values, so no two states share one
+_generations = itertools.count(1)
+
+# BLAKE2b digest size for chunk dedup; 64 bits keeps collisions negligible per collection
+_HASH_SIZE = 8
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """Largest divisor of dim that is <= dim // 8 (~8 dims per 8-bit PQ code)."""
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+    return 1
+
+
+def _chunk_hash(chunk: str) -> bytes:
+    """Content digest used to skip re-embedding identical chunks."""
+    return hashlib.blake2b(chunk.encode("utf-8"), digest_size=_HASH_SIZE).digest()
+
+
+def _read_record_frames(path: Path) -> tuple[list[str], list[dict], bool]:
+    """Read appended (chunks, metadatas) pickle frames. Returns (chunks, metadatas, complete)."""
+    chunks: list[str] = []
+    metadatas: list[dict] = []
+    size = path.stat().st_size
+    with open(path, "rb") as f:
+        while f.tell() < size:
+            try:
+                frame_chunks, frame_metas = pickle.load(f)
+            except (EOFError, pickle.UnpicklingError, ValueError, TypeError):
+                # Truncated trailing append; keep the complete frames before it
+                return chunks, metadatas, False
+            chunks.extend(frame_chunks)
+            metadatas.extend(frame_metas)
+    return chunks, metadatas, True
+
+
+def _read_jsonl(path: Path) -> list:
+    """Parse a JSONL file line by line, skipping blank or truncated lines."""
+    items = []
+    with open(path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                items.append(orjson.loads(line))
+            except ValueError:
+                break
+    return items
 
 
 class VectorStore:
-    """Vector store for RAG using FAISS and Ollama embeddings."""
+    """Vector store for RAG using FAISS and Ollama embeddings.
+
+    index_type picks the FAISS index built for a new collection: "flat" (exact
+    inner product), "ivfpq" (IVF + 8-bit product quantization, ~4x smaller and
+    faster on large corpora) or "hnsw" (graph ANN). An index already on disk is
+    loaded as-is. An "ivfpq" collection stays flat until it holds enough vectors to
+    train on; the next save then rebuilds it as IVF-PQ from all of them.
+
+    hnsw_m (graph degree) only applies when an HNSW index is built; hnsw_ef_search
+    (candidate list size per query, higher = better recall, slower search) is also
+    applied to an HNSW index loaded from disk.
+    """
 
     def __init__(
         self,
@@ -17,55 +95,208 @@ class VectorStore:
         collection_name: str = "ca_legislature_resume_rag",
         embedding_model: str = "nomic-embed-text",
         ollama_host: str = "http://localhost:11434",
+        index_type: str = "flat",
+        hnsw_m: int = _HNSW_M,
+        hnsw_ef_search: int = _HNSW_EF_SEARCH,
     ):
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}. Use one of {', '.join(INDEX_TYPES)}.")
         self.persist_dir = Path(persist_dir)
         self.persist_dir.mkdir(parents=True, exist_ok=True)
         self.collection_name = collection_name
         self.embedding_model = embedding_model
         self.ollama_host = ollama_host
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        # One client per store so embedding calls reuse the HTTP connection pool
+        self._ollama = ollama.Client(host=ollama_host)
         self._index_path = self.persist_dir / f"{collection_name}.faiss"
-        self._meta_path = self.persist_dir / f"{collection_name}_meta.json"
-        self._index: Optional[faiss.IndexFlatIP] = None
+        # Chunk texts and metadatas: one pickle frame of (chunks, metadatas) appended per save
+        self._records_path = self.persist_dir / f"{collection_name}_records.pkl"
+        # Earlier formats, read once and replaced on the next save
+        self._chunks_path = self.persist_dir / f"{collection_name}_chunks.jsonl"
+        self._meta_path = self.persist_dir / f"{collection_name}_meta.jsonl"
+        self._legacy_meta_path = self.persist_dir / f"{collection_name}_meta.json"
+        # Fixed-width chunk digests, same order as the records
+        self._hashes_path = self.persist_dir / f"{collection_name}_hashes.bin"
+        # Source file path -> SHA-256 of the files indexed so far (incremental ingest)
+        self._files_path = self.persist_dir / f"{collection_name}_files.json"
+        self._hashes: set[bytes] = set()
+        # Number of leading chunks already written to disk (0 = rewrite all)
+        self._persisted = 0
+        # Unsaved in-memory changes, and whether saves are deferred by batch_add()
+        self._dirty = False
+        self._batching = False
+        self._index: Optional[faiss.Index] = None
         self._chunks: list[str] = []
         self._metadatas: list[dict] = []
+        self._doc_types_cache: Optional[set] = None
+        self._generation = 0
         self._load()
 
     def _load(self) -> None:
         """Load index and metadata from disk if they exist."""
-        if self._index_path.exists() and self._meta_path.exists():
+        self._index = None
+        self._chunks = []
+        self._metadatas = []
+        self._persisted = 0
+        self._doc_types_cache = None
+        self._hashes = set()
+        self._generation = next(_generations)
+        if not self._index_path.exists():
+            return
+        if self._records_path.exists():
             self._index = faiss.read_index(str(self._index_path))
-            with open(self._meta_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                self._chunks = data.get("chunks", [])
-                self._metadatas = data.get("metadatas", [])
-        else:
-            self._index = None
-            self._chunks = []
-            self._metadatas = []
+            self._chunks, self._metadatas, complete = _read_record_frames(self._records_path)
+            # After a partial trailing append, rewrite the file on the next save
+            self._persisted = len(self._chunks) if complete else 0
+        elif self._chunks_path.exists() and self._meta_path.exists():
+            # JSONL sidecars; the next save rewrites them as pickle records
+            self._index = faiss.read_index(str(self._index_path))
+            self._chunks = _read_jsonl(self._chunks_path)
+            self._metadatas = _read_jsonl(self._meta_path)
+            n = min(len(self._chunks), len(self._metadatas))
+            del self._chunks[n:], self._metadatas[n:]
+        elif self._legacy_meta_path.exists():
+            # Old single-document format; the next save rewrites it as pickle records
+            self._index = faiss.read_index(str(self._index_path))
+            data = orjson.loads(self._legacy_meta_path.read_bytes())
+            self._chunks = data.get("chunks", [])
+            self._metadatas = data.get("metadatas", [])
+        self._hashes = self._load_hashes()
+        if hasattr(self._index, "hnsw"):
+            self._index.hnsw.efSearch = self.hnsw_ef_search
+
+    def configure(
+        self,
+        embedding_model: str,
+        ollama_host: str,
+        index_type: str = "flat",
+        hnsw_m: int = _HNSW_M,
+        hnsw_ef_search: int = _HNSW_EF_SEARCH,
+    ) -> None:
+        """Apply new settings to this store in place, keeping the loaded index.
+
+        index_type and hnsw_m take effect the next time an index is built (after clear()),
+        except that "ivfpq" also retrains a flat index that has grown large enough;
+        hnsw_ef_search is applied to a loaded HNSW index immediately.
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"Unsupported index type: {index_type}. Use one of {', '.join(INDEX_TYPES)}.")
+        if ollama_host != self.ollama_host:
+            self._ollama = ollama.Client(host=ollama_host)
+        self.embedding_model = embedding_model
+        self.ollama_host = ollama_host
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        if hasattr(self._index, "hnsw"):
+            self._index.hnsw.efSearch = hnsw_ef_search
+
+    def _load_hashes(self) -> set[bytes]:
+        """Read persisted chunk digests, recomputing them if the file is missing or stale."""
+        if self._persisted and self._hashes_path.exists():
+            raw = self._hashes_path.read_bytes()
+            if len(raw) == self._persisted * _HASH_SIZE:
+                return {raw[i : i + _HASH_SIZE] for i in range(0, len(raw), _HASH_SIZE)}
+        # Rewrite on the next save so the file lines up with the chunks again
+        self._persisted = 0
+        return {_chunk_hash(c) for c in self._chunks}
 
     def _embed(self, texts: list[str]) -> list[list[float]]:
         """Get embeddings from Ollama."""
-        client = ollama.Client(host=self.ollama_host)
-        response = client.embed(model=self.embedding_model, input=texts)
+        response = self._ollama.embed(model=self.embedding_model, input=texts)
         return response["embeddings"]
 
-    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
-        """L2-normalize vectors for cosine similarity via dot product."""
-        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
-        norms = np.where(norms == 0, 1, norms)
-        return vectors.astype(np.float32) / norms
+    def _normalize(self, vectors) -> np.ndarray:
+        """L2-normalize vectors for cosine similarity via dot product.
+
+        Returns a contiguous float32 array normalized in place by FAISS (zero
+        vectors are left as zeros).
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    def _build_index(self, vectors: np.ndarray) -> faiss.Index:
+        """Create an empty (trained, if needed) index for the first batch of vectors."""
+        n, dim = vectors.shape
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = self.hnsw_ef_search
+            return index
+        if self.index_type == "ivfpq" and n >= _IVFPQ_MIN_TRAIN:
+            return self._train_ivfpq(vectors)
+        return faiss.IndexFlatIP(dim)
+
+    def _train_ivfpq(self, vectors: np.ndarray) -> faiss.Index:
+        """Create an empty IVF-PQ index trained on vectors."""
+        n, dim = vectors.shape
+        nlist = max(1, int(np.sqrt(n)))
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(
+            quantizer, dim, nlist, _pq_subquantizers(dim), 8, faiss.METRIC_INNER_PRODUCT
+        )
+        index.train(vectors)
+        index.nprobe = min(nlist, _IVFPQ_NPROBE)
+        return index
+
+    def _maybe_upgrade_to_ivfpq(self) -> None:
+        """Retrain a flat index as IVF-PQ once it holds enough vectors.
+
+        Ingest adds chunks a batch at a time, so the first batch alone is usually too
+        small to train on; the flat index collects them until the whole corpus can be used.
+        """
+        if (
+            self.index_type != "ivfpq"
+            or type(self._index) is not faiss.IndexFlatIP
+            or self._index.ntotal < _IVFPQ_MIN_TRAIN
+        ):
+            return
+        vectors = self._index.reconstruct_n(0, self._index.ntotal)
+        index = self._train_ivfpq(vectors)
+        index.add(vectors)
+        self._index = index
+        self._generation = next(_generations)
 
     def add_chunks(
         self,
         chunks: list[str],
         metadatas: list[dict],
         ids: Optional[list[str]] = None,
-        batch_size: int = 32,
+        batch_size: int = 256,
+        flush: bool = True,
+        max_workers: int = 4,
     ) -> int:
-        """Add chunks to the vector store. Returns count added."""
+        """Add chunks to the vector store. Returns count added.
+
+        Chunks whose exact text is already stored (or repeated within this call) are
+        skipped without being embedded. The rest are embedded in batches of
+        ``batch_size`` per Ollama request; large batches keep round-trips low while
+        bounding the request payload. Up to ``max_workers`` batch requests are in
+        flight at once (the server only runs them side by side with
+        OLLAMA_NUM_PARALLEL > 1); embeddings keep the input order.
+
+        With flush=False (or inside batch_add()) the index is not written to disk
+        until flush() or the end of the batch.
+        """
         if not chunks:
             return 0
 
+        new_hashes: set[bytes] = set()
+        unique_chunks, unique_metadatas = [], []
+        for chunk, meta in zip(chunks, metadatas):
+            h = _chunk_hash(chunk)
+            if h in self._hashes or h in new_hashes:
+                continue
+            new_hashes.add(h)
+            unique_chunks.append(chunk)
+            unique_metadatas.append(meta)
+        if not unique_chunks:
+            return 0
+        chunks, metadatas = unique_chunks, unique_metadatas
+
         # ChromaDB-style metadata: only str, int, float, bool
         clean_metadatas = []
         for m in metadatas:
@@ -79,41 +310,103 @@ class VectorStore:
                     clean[k] = str(v) if v else ""
             clean_metadatas.append(clean)
 
+        batches = [chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)]
         all_embeddings = []
-        for i in range(0, len(chunks), batch_size):
-            batch = chunks[i : i + batch_size]
-            emb = self._embed(batch)
-            all_embeddings.extend(emb)
+        if len(batches) > 1 and max_workers > 1:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(batches))) as executor:
+                for emb in executor.map(self._embed, batches):
+                    all_embeddings.extend(emb)
+        else:
+            for batch in batches:
+                all_embeddings.extend(self._embed(batch))
 
-        vectors = np.array(all_embeddings, dtype=np.float32)
-        vectors = self._normalize(vectors)
-        dim = vectors.shape[1]
+        vectors = self._normalize(all_embeddings)
 
         if self._index is None:
-            self._index = faiss.IndexFlatIP(dim)
+            self._index = self._build_index(vectors)
 
         self._index.add(vectors)
         self._chunks.extend(chunks)
         self._metadatas.extend(clean_metadatas)
-        self._save()
+        self._hashes |= new_hashes
+        self._doc_types_cache = None
+        self._generation = next(_generations)
+        self._dirty = True
+        if flush and not self._batching:
+            self._save()
         return len(chunks)
 
+    @contextmanager
+    def batch_add(self) -> Iterator["VectorStore"]:
+        """Defer saving across several add_chunks calls; writes once when the block exits."""
+        if self._batching:
+            yield self
+            return
+        self._batching = True
+        try:
+            yield self
+        finally:
+            self._batching = False
+            self.flush()
+
+    def flush(self) -> None:
+        """Write pending changes to disk, if any."""
+        if self._dirty:
+            self._save()
+
     def _save(self) -> None:
-        """Persist index and metadata to disk."""
+        """Persist index to disk and append chunks added since the last save."""
+        self._maybe_upgrade_to_ivfpq()
         if self._index is not None:
             faiss.write_index(self._index, str(self._index_path))
-        with open(self._meta_path, "w", encoding="utf-8") as f:
-            json.dump({"chunks": self._chunks, "metadatas": self._metadatas}, f, indent=0)
+        mode = "ab" if self._persisted else "wb"
+        new_chunks = self._chunks[self._persisted :]
+        new_metas = self._metadatas[self._persisted :]
+        with open(self._records_path, mode) as f:
+            # Binary frames skip JSON's per-character escaping of chunk text
+            pickle.dump((new_chunks, new_metas), f, protocol=5)
+        with open(self._hashes_path, mode) as f:
+            f.writelines(_chunk_hash(c) for c in new_chunks)
+        self._persisted = len(self._chunks)
+        self._dirty = False
+        for path in (self._chunks_path, self._meta_path, self._legacy_meta_path):
+            if path.exists():
+                path.unlink()
 
     def clear(self) -> None:
         """Clear the collection."""
         self._index = None
         self._chunks = []
         self._metadatas = []
-        if self._index_path.exists():
-            self._index_path.unlink()
-        if self._meta_path.exists():
-            self._meta_path.unlink()
+        self._persisted = 0
+        self._doc_types_cache = None
+        self._hashes = set()
+        self._generation = next(_generations)
+        self._dirty = False
+        for path in (
+            self._index_path,
+            self._records_path,
+            self._chunks_path,
+            self._meta_path,
+            self._hashes_path,
+            self._legacy_meta_path,
+            self._files_path,
+        ):
+            if path.exists():
+                path.unlink()
+
+    def file_hashes(self) -> dict[str, str]:
+        """Source file hashes recorded by the last save_file_hashes ({} if none)."""
+        if not self._files_path.exists():
+            return {}
+        try:
+            return orjson.loads(self._files_path.read_bytes())
+        except ValueError:
+            return {}
+
+    def save_file_hashes(self, hashes: dict[str, str]) -> None:
+        """Record which source files (path -> SHA-256) the collection now covers."""
+        self._files_path.write_bytes(orjson.dumps(hashes))
 
     def search(
         self,
@@ -122,25 +415,48 @@ class VectorStore:
         include_doc_types: Optional[list[str]] = None,
     ) -> list[dict]:
         """Search for similar chunks. Returns list of {content, metadata, distance}."""
-        if self._index is None or len(self._chunks) == 0:
+        return self.search_batch([query], top_k=top_k, include_doc_types=include_doc_types)[0]
+
+    def search_batch(
+        self,
+        queries: list[str],
+        top_k: int = 12,
+        include_doc_types: Optional[list[str]] = None,
+    ) -> list[list[dict]]:
+        """Search for several queries with one embedding call and one FAISS search.
+
+        Returns one result list per query, in the same shape as search().
+        """
+        if not queries:
             return []
+        if self._index is None or len(self._chunks) == 0:
+            return [[] for _ in queries]
 
-        query_embedding = np.array(self._embed([query]), dtype=np.float32)
-        query_embedding = self._normalize(query_embedding)
+        query_embeddings = self._normalize(self._embed(list(queries)))
 
-        # FAISS IndexFlatIP returns inner product (cosine sim for normalized vecs)
-        # We fetch extra if filtering, then filter and trim
-        fetch_k = top_k * 4 if include_doc_types else top_k
+        # Inner-product indexes return cosine sim for normalized vecs (approximate for PQ).
+        # Over-fetch only when the filter actually excludes doc types in the store.
+        allowed = set(include_doc_types) if include_doc_types else None
+        if allowed is not None and self._doc_types() <= allowed:
+            allowed = None
+        fetch_k = top_k * 4 if allowed is not None else top_k
         fetch_k = min(fetch_k, self._index.ntotal)
 
-        scores, indices = self._index.search(query_embedding, fetch_k)
+        scores, indices = self._index.search(query_embeddings, fetch_k)
+
+        return [
+            self._collect_hits(row_indices, row_scores, top_k, allowed)
+            for row_indices, row_scores in zip(indices, scores)
+        ]
 
+    def _collect_hits(self, indices, scores, top_k: int, allowed: Optional[set]) -> list[dict]:
+        """Turn one row of FAISS results into filtered result dicts."""
         output = []
-        for idx, score in zip(indices[0], scores[0]):
+        for idx, score in zip(indices, scores):
             if idx < 0 or idx >= len(self._chunks):
                 continue
             meta = self._metadatas[idx]
-            if include_doc_types and meta.get("doc_type") not in include_doc_types:
+            if allowed is not None and meta.get("doc_type") not in allowed:
                 continue
             # Convert IP (higher=better) to distance (lower=better) for consistency
             distance = 1.0 - float(score)
@@ -151,9 +467,24 @@ class VectorStore:
             })
             if len(output) >= top_k:
                 break
-
         return output
 
+    def _doc_types(self) -> set:
+        """Distinct doc_type values in the collection (cached until chunks change)."""
+        if self._doc_types_cache is None:
+            self._doc_types_cache = {m.get("doc_type") for m in self._metadatas}
+        return self._doc_types_cache
+
+    @property
+    def is_hnsw(self) -> bool:
+        """Whether the loaded index is HNSW, the only kind hnsw_m/hnsw_ef_search affect."""
+        return hasattr(self._index, "hnsw")
+
+    @property
+    def generation(self) -> int:
+        """Changes whenever the stored chunks or index do (load, add, clear, retrain)."""
+        return self._generation
+
     def count(self) -> int:
         """Return number of chunks in the collection."""
         if self._index is None:
@@ -8,12 +8,20 @@ if str(_PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(_PROJECT_ROOT))
 
 import streamlit as st
+import io
+import itertools
+import os
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date
+from functools import lru_cache
+from typing import Optional
 
 from app.config import (
     SOURCES_DIR,
     CHROMA_DIR,
+    LOADER_CACHE_DIR,
     OUTPUTS_DIR,
     GENERATED_DIR,
     RESUMES_DIR,
@@ -25,8 +33,11 @@ from app.config import (
     CHUNK_SIZE,
     CHUNK_OVERLAP,
     DEFAULT_TOP_K,
+    DEFAULT_INDEX_TYPE,
+    DEFAULT_HNSW_M,
+    DEFAULT_HNSW_EF_SEARCH,
 )
-from app.ingestion import load_documents_from_dir, load_uploaded_file, chunk_documents, VectorStore
+from app.ingestion import load_documents_from_dir, load_uploaded_file, source_file_hashes, chunk_documents_fast, INDEX_TYPES, VectorStore
 from app.retrieval import retrieve_context, extract_keywords
 from app.generation import (
     build_resume_prompt,
@@ -34,11 +45,53 @@ from app.generation import (
     save_output,
     get_output_filename_with_ext,
     load_history,
+    get_history_path,
 )
 from app.utils.contact import load_contact_config, save_contact_config, parse_vcard
-from app.utils.html_export import md_to_html
+from app.utils.html_export import md_to_html, save_html, ensure_theme_css
 
 
+# Job descriptions are arbitrary pasted text; use RE2's linear-time matcher when
+# google-re2 is installed so the permissive patterns below can't backtrack badly.
+# re2 has no flag constants, so flags are written inline in each pattern.
+try:
+    import re2 as _rx
+except ImportError:
+    _rx = re
+
+_JOB_TITLE_PATTERNS = [
+    _rx.compile("(?im)" + p)
+    for p in (
+        r"(?:Position|Job\s*Title|Title)\s*[:\-]\s*([^\n\r]{5,80})",
+        r"(?:Seeking|Hiring)\s+(?:a|an)?\s*([A-Za-z\s\-]+(?:Assistant|Analyst|Director|Coordinator|Specialist|Manager))",
+        r"^([A-Za-z\s\-]+(?:Legislative\s+Assistant|Legislative\s+Analyst|Staff\s+Assistant|District\s+Director))(?:\s|$|,)",
+    )
+]
+_EMAIL_RE = _rx.compile(r"(?i)([A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,})")
+_PHONE_RE = _rx.compile(r"(?i)(\+?1[\s\-\.]?)?(\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4})")
+_NAME_PATTERNS = [
+    _rx.compile(r"(Hiring\s+Manager|Hiring\s+Contact|Contact\s+Person|Contact)\s*[:\-]\s*(.+)"),
+    _rx.compile(r"(ATTN|Attn|Attention)\s*[:\-]\s*(.+)"),
+]
+_ORG_RE = _rx.compile(r"(California\s+State\s+Senate|California\s+State\s+Assembly|Office\s+of\s+[A-Z][^\n\r]{3,80}|Department\s+of\s+[A-Z][^\n\r]{3,80}|Committee\s+on\s+[A-Z][^\n\r]{3,80})")
+# Email, phone and org scanned in one pass; the per-field patterns above are
+# kept to recover a match that overlaps (and was consumed by) another field's.
+_CONTACT_FIELDS = {
+    "contact_email": _EMAIL_RE,
+    "contact_phone": _PHONE_RE,
+    "contact_org": _ORG_RE,
+}
+_COMBINED_RE = _rx.compile(
+    r"(?P<contact_email>(?i:[A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,}))"
+    r"|(?P<contact_phone>(?i:(?:\+?1[\s\-\.]?)?\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4}))"
+    r"|(?P<contact_org>California\s+State\s+Senate|California\s+State\s+Assembly|Office\s+of\s+[A-Z][^\n\r]{3,80}|Department\s+of\s+[A-Z][^\n\r]{3,80}|Committee\s+on\s+[A-Z][^\n\r]{3,80})"
+)
+_FIELD_END_RE = _rx.compile(r"[\n\r,;]")
+_SCAN_HEAD_CHARS = 20000
+_SCAN_TAIL_CHARS = 4000
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
 def extract_contact_info(job_description: str) -> dict:
     """
     Best-effort extraction of contact info from a job description.
@@ -52,62 +105,80 @@ def extract_contact_info(job_description: str) -> dict:
         "contact_phone": "",
         "contact_org": "",
     }
+    if not text:
+        return result
+
+    # Contact details sit near the top (title, contact lines) or the bottom
+    # (signature block) of a posting, so very long pastes are only scanned there.
+    head = text[:_SCAN_HEAD_CHARS]
+    tail = text[-_SCAN_TAIL_CHARS:] if len(text) > _SCAN_HEAD_CHARS else ""
+    edges = head + "\n" + tail if tail else head
 
     # Job title (common patterns)
-    for pattern in [
-        r"(?:Position|Job\s*Title|Title)\s*[:\-]\s*([^\n\r]{5,80})",
-        r"(?:Seeking|Hiring)\s+(?:a|an)?\s*([A-Za-z\s\-]+(?:Assistant|Analyst|Director|Coordinator|Specialist|Manager))",
-        r"^([A-Za-z\s\-]+(?:Legislative\s+Assistant|Legislative\s+Analyst|Staff\s+Assistant|District\s+Director))(?:\s|$|,)",
-    ]:
-        m = re.search(pattern, text, re.IGNORECASE | re.MULTILINE)
+    for pattern in _JOB_TITLE_PATTERNS:
+        m = pattern.search(head)
         if m:
             title = m.group(1).strip()
-            title = re.split(r"[\n\r,;]", title)[0].strip()
+            title = _FIELD_END_RE.split(title)[0].strip()
             if 5 <= len(title) <= 80:
                 result["job_title"] = title
                 break
 
-    # Email
-    email_match = re.search(r"([A-Z0-9._%+-]+@[A-Z0-9.-]+\.[A-Z]{2,})", text, re.IGNORECASE)
-    if email_match:
-        result["contact_email"] = email_match.group(1).strip()
-
-    # Phone (very permissive)
-    phone_match = re.search(
-        r"(\+?1[\s\-\.]?)?(\(?\d{3}\)?[\s\-\.]?\d{3}[\s\-\.]?\d{4})",
-        text,
-        re.IGNORECASE,
-    )
-    if phone_match:
-        result["contact_phone"] = phone_match.group(0).strip()
+    # Email, phone (very permissive) and organization (common government
+    # phrasing): first match of each, found in a single scan
+    missing = set(_CONTACT_FIELDS)
+    # Next per-field match at or after the current position; only re-searched once the
+    # scan passes it, so each per-field pattern walks the text at most once
+    next_hit: dict = {}
+    for m in _COMBINED_RE.finditer(edges):
+        field = m.lastgroup
+        if field in missing:
+            result[field] = m.group(field).strip()
+            missing.discard(field)
+        for other in tuple(missing):
+            hit = next_hit.get(other)
+            if hit is None or hit.start() < m.start():
+                hit = next_hit[other] = _CONTACT_FIELDS[other].search(edges, m.start())
+            if hit is None:
+                # No match anywhere ahead; the combined scan can't find one either
+                missing.discard(other)
+            elif hit.start() < m.end():
+                result[other] = hit.group(0).strip()
+                missing.discard(other)
+        if not missing:
+            break
 
     # Hiring manager / contact name lines
-    for pattern in [
-        r"(Hiring\s+Manager|Hiring\s+Contact|Contact\s+Person|Contact)\s*[:\-]\s*(.+)",
-        r"(ATTN|Attn|Attention)\s*[:\-]\s*(.+)",
-    ]:
-        m = re.search(pattern, text)
+    for pattern in _NAME_PATTERNS:
+        m = pattern.search(head)
         if m:
             name = m.group(m.lastindex).strip()
             # Trim trailing punctuation and overly-long captures
-            name = re.split(r"[\n\r,;]", name)[0].strip()
+            name = _FIELD_END_RE.split(name)[0].strip()
             if 2 <= len(name) <= 80:
                 result["hiring_manager_name"] = name
                 break
 
-    # Organization guess (common government phrasing)
-    org_match = re.search(r"(California\s+State\s+Senate|California\s+State\s+Assembly|Office\s+of\s+[A-Z][^\n\r]{3,80}|Department\s+of\s+[A-Z][^\n\r]{3,80}|Committee\s+on\s+[A-Z][^\n\r]{3,80})", text)
-    if org_match:
-        result["contact_org"] = org_match.group(1).strip()
-
     return result
 
 
+_STREAM_RENDER_INTERVAL = 0.05
+# Chunks handed to add_chunks at a time: four 256-chunk embed requests in flight
+_INGEST_BATCH = 1024
+
+
+@lru_cache(maxsize=4)
+def _get_ollama_client(host: str):
+    """One ollama.Client per host, so reruns reuse its keep-alive connection pool."""
+    import ollama
+    return ollama.Client(host=host)
+
+
+@st.cache_data(ttl=30, show_spinner=False)
 def check_ollama_health(host: str, embed_model: str, llm_model: str) -> tuple[bool, str]:
     """Verify Ollama is running and models exist. Returns (ok, error_message)."""
     try:
-        import ollama
-        client = ollama.Client(host=host)
+        client = _get_ollama_client(host)
         client.embed(model=embed_model, input="test")
         return True, ""
     except Exception as e:
@@ -119,7 +190,88 @@ def check_ollama_health(host: str, embed_model: str, llm_model: str) -> tuple[bo
         return False, f"Ollama error: {e}"
 
 
-def run_generation(
+@st.cache_resource(show_spinner=False)
+def get_vector_store(persist_dir: str) -> VectorStore:
+    """
+    One VectorStore per persist dir, kept across reruns instead of reloading the index.
+    Keyed on the directory only: two live instances over the same files would each
+    rewrite them from their own state. Settings are applied with VectorStore.configure.
+    """
+    return VectorStore(persist_dir=Path(persist_dir))
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=600)
+def _cached_retrieve(
+    _vector_store: VectorStore,
+    index_key: tuple,
+    query: str,
+    top_k: int,
+    include_doc_types: Optional[tuple[str, ...]],
+) -> tuple[str, list[dict]]:
+    """
+    retrieve_context memoized per query, so reruns don't re-embed an unchanged job description.
+    The store itself isn't hashed; index_key (embedding model, store generation, index settings)
+    changes on every re-index or when search settings change.
+    """
+    return retrieve_context(
+        _vector_store,
+        query,
+        top_k=top_k,
+        include_doc_types=list(include_doc_types) if include_doc_types else None,
+    )
+
+
+def _read_uploaded_text(uploaded_file) -> str:
+    """Decode an UploadedFile (a BytesIO) as UTF-8 straight from its buffer, without a getvalue() copy."""
+    uploaded_file.seek(0)
+    reader = io.TextIOWrapper(uploaded_file, encoding="utf-8", errors="replace", newline="")
+    try:
+        return reader.read()
+    finally:
+        # Detach so the wrapper doesn't close the upload when it's garbage collected
+        reader.detach()
+
+
+def _stat_key(path: Path) -> Optional[tuple[int, int]]:
+    """(mtime_ns, size) of path, or None if missing; cache key that changes when it's written."""
+    try:
+        st_result = os.stat(path)
+    except OSError:
+        return None
+    return st_result.st_mtime_ns, st_result.st_size
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def _cached_history(outputs_dir: str, history_key: Optional[tuple[int, int]]) -> list[dict]:
+    """load_history memoized until the history file changes (history_key is its _stat_key)."""
+    return load_history(Path(outputs_dir))
+
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl=5)
+def _list_generated_files(outputs_dir: str, dir_key: Optional[tuple[int, int]]) -> list[str]:
+    """
+    Names of .md/.txt files in outputs_dir, newest first. dir_key (the folder's
+    _stat_key) changes when files are added or removed; the short TTL covers edits in place.
+    """
+    try:
+        with os.scandir(outputs_dir) as it:
+            entries = [
+                e for e in it
+                if e.name.lower().endswith((".md", ".txt")) and not e.name.startswith(".") and e.is_file()
+            ]
+    except OSError:
+        return []
+    entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    return [e.name for e in entries]
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _md_to_html_cached(md: str, title: str) -> str:
+    """md_to_html memoized per (markdown, title) so editor reruns skip re-rendering."""
+    return md_to_html(md, title=title)
+
+
+def _generation_messages(
     prompt_type: str,
     job_desc: str,
     context: str,
@@ -132,12 +284,8 @@ def run_generation(
     my_email: str,
     my_phone: str,
     my_address: str,
-    llm_model: str,
-    ollama_host: str,
-) -> str:
-    """Generate resume or cover letter using Ollama."""
-    import ollama
-    client = ollama.Client(host=ollama_host)
+) -> list[dict]:
+    """Chat messages for a resume or cover letter request."""
     if prompt_type == "resume":
         system, user = build_resume_prompt(
             job_description=job_desc,
@@ -162,14 +310,55 @@ def run_generation(
             my_phone=my_phone,
             my_address=my_address,
         )
-    response = client.chat(
-        model=llm_model,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": user},
-        ],
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user},
+    ]
+
+
+def run_generation(
+    prompt_type: str,
+    job_desc: str,
+    context: str,
+    job_title: str,
+    hiring_manager_name: str,
+    contact_email: str,
+    contact_phone: str,
+    contact_org: str,
+    my_name: str,
+    my_email: str,
+    my_phone: str,
+    my_address: str,
+    llm_model: str,
+    ollama_host: str,
+    placeholder=None,
+) -> str:
+    """
+    Generate resume or cover letter using Ollama.
+    With a placeholder (st.empty()), the response is streamed into it as it arrives
+    and the placeholder is cleared once the full text is returned.
+    """
+    client = _get_ollama_client(ollama_host)
+    messages = _generation_messages(
+        prompt_type, job_desc, context, job_title,
+        hiring_manager_name, contact_email, contact_phone, contact_org,
+        my_name, my_email, my_phone, my_address,
     )
-    return response["message"]["content"]
+    if placeholder is None:
+        response = client.chat(model=llm_model, messages=messages)
+        return response["message"]["content"]
+
+    parts: list[str] = []
+    last_render = 0.0
+    for part in client.chat(model=llm_model, messages=messages, stream=True):
+        parts.append(part["message"]["content"])
+        # Re-render at most every _STREAM_RENDER_INTERVAL s, not once per token
+        now = time.monotonic()
+        if now - last_render >= _STREAM_RENDER_INTERVAL:
+            placeholder.markdown("".join(parts))
+            last_render = now
+    placeholder.empty()
+    return "".join(parts)
 
 
 def main():
@@ -206,6 +395,24 @@ def main():
         embed_model = st.text_input("Embedding model", value=EMBEDDING_MODEL, key="embed_model")
         llm_model = st.text_input("LLM model", value=LLM_MODEL, key="llm_model")
         top_k = st.slider("Retrieval chunks (k)", min_value=5, max_value=20, value=DEFAULT_TOP_K)
+        with st.expander("Vector index"):
+            index_type = st.selectbox(
+                "Index type",
+                INDEX_TYPES,
+                index=INDEX_TYPES.index(DEFAULT_INDEX_TYPE),
+                key="index_type",
+                help="flat = exact search; hnsw = graph search that stays fast on large corpora; ivfpq = compressed, used once the index holds ~10k chunks (flat until then). Takes effect on a full rebuild.",
+            )
+            hnsw_m = st.number_input(
+                "HNSW M", min_value=8, max_value=64, value=DEFAULT_HNSW_M, step=8, key="hnsw_m",
+                disabled=index_type != "hnsw",
+                help="Links per node. Higher improves recall but uses more memory; takes effect on a full rebuild.",
+            )
+            hnsw_ef_search = st.number_input(
+                "HNSW efSearch", min_value=16, max_value=512, value=DEFAULT_HNSW_EF_SEARCH, step=16, key="hnsw_ef_search",
+                disabled=index_type != "hnsw",
+                help="Candidates checked per query. Higher trades latency for recall; applies immediately.",
+            )
         st.divider()
         st.caption("Paths")
         st.code(f"sources: {SOURCES_DIR}", language=None)
@@ -231,7 +438,7 @@ def main():
         vcf_file = st.file_uploader("Or import from vCard (.vcf)", type=["vcf"], key="vcf_upload")
         if vcf_file and st.session_state.get("_last_vcf") != vcf_file.name:
             try:
-                content = vcf_file.getvalue().decode("utf-8", errors="replace")
+                content = _read_uploaded_text(vcf_file)
                 parsed = parse_vcard(content)
                 for k, v in parsed.items():
                     if v:
@@ -245,6 +452,9 @@ def main():
     # Health check (show warning but don't block the UI)
     ok, err = check_ollama_health(ollama_host, embed_model, llm_model)
     if not ok:
+        # Only a healthy probe is worth reusing; re-check on the next rerun once the
+        # server is started or the models are pulled
+        check_ollama_health.clear()
         st.warning(f"**Setup required:** {err}")
         st.info("Pull the models in a terminal: `ollama pull nomic-embed-text` and `ollama pull llama3.2` — then refresh this page. You can still add documents below.")
         st.divider()
@@ -256,11 +466,8 @@ def main():
     CHROMA_DIR.mkdir(parents=True, exist_ok=True)
     # (outputs dir is created from sidebar input above)
 
-    vector_store = VectorStore(
-        persist_dir=CHROMA_DIR,
-        embedding_model=embed_model,
-        ollama_host=ollama_host,
-    )
+    vector_store = get_vector_store(str(CHROMA_DIR))
+    vector_store.configure(embed_model, ollama_host, index_type, int(hnsw_m), int(hnsw_ef_search))
     chunk_count = vector_store.count()
 
     # Tabs
@@ -294,9 +501,9 @@ def main():
             key="file_uploader",
         )
         if uploaded:
-            for f in uploaded:
-                dest = target_dir / f.name
-                dest.write_bytes(f.getvalue())
+            # Overlap disk writes when several files are dropped at once
+            with ThreadPoolExecutor(max_workers=min(8, len(uploaded))) as executor:
+                list(executor.map(lambda f: (target_dir / f.name).write_bytes(f.getvalue()), uploaded))
             st.success(f"Saved {len(uploaded)} file(s) to `sources/{doc_type}/`")
 
         st.divider()
@@ -311,29 +518,50 @@ def main():
         st.code(str(SOURCES_DIR.resolve()), language=None)
 
         st.divider()
+        full_rebuild = st.checkbox(
+            "Full rebuild",
+            key="full_rebuild",
+            help="Re-embed every document. Otherwise only new files are indexed (changed or removed files still trigger a rebuild).",
+        )
         if st.button("Process & Index", type="primary", key="process_index"):
             if not ok:
                 st.error("Ollama models required. Run: `ollama pull nomic-embed-text` and `ollama pull llama3.2`")
             else:
-                docs = list(load_documents_from_dir(SOURCES_DIR))
-                if not docs:
+                current_files = source_file_hashes(SOURCES_DIR)
+                indexed_files = vector_store.file_hashes()
+                # Chunks can't be dropped per file, so a changed or removed file forces a rebuild
+                rebuild = full_rebuild or not indexed_files or any(
+                    current_files.get(path) != digest for path, digest in indexed_files.items()
+                )
+                pending = set(current_files) if rebuild else current_files.keys() - indexed_files.keys()
+                docs = load_documents_from_dir(SOURCES_DIR, cache_dir=LOADER_CACHE_DIR, paths=pending)
+                first_doc = next(docs, None)
+                if first_doc is None and current_files and not pending:
+                    st.info("Index is up to date: no new or changed files in sources/.")
+                elif first_doc is None:
                     st.warning("No documents found in sources/. Add or upload PDF, DOCX, or TXT files.")
                 else:
                     try:
                         with st.spinner("Chunking and embedding..."):
-                            progress = st.progress(0)
-                            chunks = list(chunk_documents(
-                                iter(docs),
+                            status = st.empty()
+                            if rebuild:
+                                vector_store.clear()
+                            # Stream docs -> chunks -> embeddings in micro-batches instead of
+                            # materializing the whole corpus first; the index is written once.
+                            doc_count = added = 0
+                            chunk_iter = chunk_documents_fast(
+                                itertools.chain((first_doc,), docs),
                                 chunk_size=CHUNK_SIZE,
                                 overlap=CHUNK_OVERLAP,
-                            ))
-                            progress.progress(0.3)
-                            vector_store.clear()
-                            chunk_texts = [c[0] for c in chunks]
-                            chunk_metas = [c[1] for c in chunks]
-                            added = vector_store.add_chunks(chunk_texts, chunk_metas)
-                            progress.progress(1.0)
-                        st.success(f"Indexed {len(docs)} documents, {added} chunks.")
+                            )
+                            with vector_store.batch_add():
+                                while batch := list(itertools.islice(chunk_iter, _INGEST_BATCH)):
+                                    batch_texts, batch_metas = map(list, zip(*batch))
+                                    doc_count += sum(meta["chunk_index"] == 0 for meta in batch_metas)
+                                    added += vector_store.add_chunks(batch_texts, batch_metas)
+                                    status.caption(f"{doc_count} documents, {added} chunks embedded…")
+                            vector_store.save_file_hashes(current_files)
+                        st.success(f"Indexed {doc_count} documents, {added} chunks.")
                         st.rerun()
                     except Exception as e:
                         st.error(f"Indexing failed: {e}. Make sure Ollama is running and models are pulled.")
@@ -395,19 +623,35 @@ def main():
         context_resume = ""
         chunks_preview = []
         if job_desc_resume.strip():
-            context_resume, chunks_preview = retrieve_context(
-                vector_store, job_desc_resume.strip(), top_k=top_k, include_doc_types=include_doc_types
-            )
             kw = extract_keywords(job_desc_resume.strip())
             if kw:
                 st.caption(f"Keywords: {', '.join(kw[:12])}{'…' if len(kw) > 12 else ''}")
-            with st.expander("Preview retrieved chunks"):
+
+        # Retrieval embeds the query, so it only runs on an explicit preview or
+        # generate click rather than on every edit of the job description.
+        preview_clicked = st.button("Preview retrieved chunks", key="preview_resume_chunks")
+        generate_clicked = st.button("Generate Resume", type="primary", key="gen_resume")
+        if job_desc_resume.strip() and (preview_clicked or generate_clicked):
+            context_resume, chunks_preview = _cached_retrieve(
+                vector_store,
+                (
+                    vector_store.embedding_model,
+                    vector_store.generation,
+                    vector_store.index_type,
+                    # The HNSW knobs only change results when the loaded index is HNSW
+                    (vector_store.hnsw_m, vector_store.hnsw_ef_search) if vector_store.is_hnsw else None,
+                ),
+                job_desc_resume.strip(),
+                top_k,
+                tuple(include_doc_types) if include_doc_types else None,
+            )
+            with st.expander("Retrieved chunks", expanded=preview_clicked):
                 for i, c in enumerate(chunks_preview):
                     st.markdown(f"**{i+1}. {c['source']}** ({c['doc_type']})")
                     st.text(c["content"][:300] + ("..." if len(c["content"]) > 300 else ""))
                     st.divider()
 
-        if st.button("Generate Resume", type="primary", key="gen_resume"):
+        if generate_clicked:
             if job_desc_resume.strip() and context_resume:
                 with st.spinner("Generating resume..."):
                     resume = run_generation(
@@ -425,6 +669,7 @@ def main():
                         st.session_state.my_address,
                         llm_model,
                         ollama_host,
+                        placeholder=st.empty(),
                     )
                     st.session_state.generated_resume = resume
                     save_output(resume, "resume", job_title_resume, outputs_dir, ext="md")
@@ -522,6 +767,7 @@ def main():
                         st.session_state.my_address,
                         llm_model,
                         ollama_host,
+                        placeholder=st.empty(),
                     )
                     st.session_state.generated_letter = letter
                     save_output(letter, "cover_letter", job_title_letter, outputs_dir, ext="md")
@@ -541,7 +787,7 @@ def main():
                 st.success("Saved.")
 
         # Generation history (both resume and letter)
-        history = load_history(outputs_dir)
+        history = _cached_history(str(outputs_dir), _stat_key(get_history_path(outputs_dir)))
         if history:
             with st.expander("📜 Recent generations"):
                 for i, entry in enumerate(history[:15]):
@@ -554,8 +800,8 @@ def main():
                         st.caption(f"{ts} — {typ} for {jt}")
                     with col2:
                         if Path(fp).exists():
-                            content = Path(fp).read_text(encoding="utf-8")
                             if st.button("Load", key=f"hist_load_{i}"):
+                                content = Path(fp).read_text(encoding="utf-8")
                                 if typ == "resume":
                                     st.session_state.generated_resume = content
                                     st.session_state.resume_display = content
@@ -593,13 +839,9 @@ def main():
 
         if md_source == "Load from generated folder":
             # List .md and .txt files, newest first
-            gen_files = sorted(
-                [f for f in outputs_dir.glob("*") if f.suffix.lower() in (".md", ".txt") and f.name != "history.json"],
-                key=lambda p: p.stat().st_mtime,
-                reverse=True,
-            )
+            gen_files = _list_generated_files(str(outputs_dir), _stat_key(outputs_dir))
             if gen_files:
-                file_options = [""] + [f.name for f in gen_files]
+                file_options = [""] + gen_files
                 selected_from_folder = st.selectbox(
                     "Choose file",
                     options=file_options,
@@ -630,7 +872,7 @@ def main():
                 key="css_editor_upload",
             )
             if uploaded_md:
-                md_content = uploaded_md.getvalue().decode("utf-8", errors="replace")
+                md_content = _read_uploaded_text(uploaded_md)
                 st.success(f"Loaded {uploaded_md.name}")
 
         # Persist editor content when source changes
@@ -666,7 +908,7 @@ def main():
             )
 
             if edited_md.strip():
-                html_output = md_to_html(edited_md.strip(), title=doc_title or "Document")
+                html_output = _md_to_html_cached(edited_md.strip(), doc_title or "Document")
 
                 st.divider()
                 st.write("**Preview**")
@@ -675,6 +917,7 @@ def main():
                 st.divider()
                 col1, col2, col3 = st.columns([1, 1, 2])
                 with col1:
+                    # Same memoized string as the preview, so offering it costs no extra render
                     st.download_button(
                         "Download HTML",
                         html_output,
@@ -686,10 +929,11 @@ def main():
                     if st.button("Save HTML to generated folder", key="save_css_editor_html"):
                         out_name = f"HTML-{doc_title or 'output'}-{date.today().strftime('%Y-%m-%d')}.html"
                         out_path = outputs_dir / out_name
-                        out_path.write_text(html_output, encoding="utf-8")
+                        ensure_theme_css(outputs_dir)
+                        save_html(md_to_html(edited_md.strip(), title=doc_title or "Document", inline_css=False), out_path)
                         st.success(f"Saved to {out_path}")
                 with col3:
-                    st.caption("Open the HTML file in a browser and use File → Print → Save as PDF.")
+                    st.caption("Open the HTML file in a browser and use File → Print → Save as PDF. Saved files share `ca-legislature.css` in the same folder.")
         else:
             st.info("Select a source above or choose **Paste / edit below** to enter Markdown.")
 
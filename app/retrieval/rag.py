@@ -1,6 +1,7 @@
 """RAG retrieval logic with keyword-augmented semantic search."""
 import re
-from typing import Optional
+from functools import lru_cache
+from typing import Iterator, Optional
 
 from app.ingestion.vector_store import VectorStore
 
@@ -12,6 +13,35 @@ CA_LEG_KEYWORDS = [
     "communications", "outreach", "scheduling", "correspondence",
 ]
 
+_BULLET_RE = re.compile(r"^[\*\-]\s*(.+?)(?:\n|$)", re.MULTILINE | re.IGNORECASE)
+_SPLIT_RE = re.compile(r"\W+")
+_CAPS_PHRASE_RE = re.compile(r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b")
+_WORD_RE = re.compile(r"\b([a-z]{4,})\b")
+_STOPWORDS = frozenset({"that", "this", "with", "from", "have", "will", "your", "they", "when", "what"})
+
+
+def _keyword_candidates(text: str, text_lower: str) -> Iterator[str]:
+    """Yield candidate keywords in priority order; the caller drops repeats."""
+    # 2. Extract phrases from bullet lines (- item, * item)
+    for m in _BULLET_RE.finditer(text):
+        phrase = m.group(1).strip()[:60]
+        # Take first few significant words
+        words = [w for w in _SPLIT_RE.split(phrase) if len(w) > 2][:5]
+        for w in words:
+            yield w.lower()
+
+    # 3. Extract capitalized multi-word phrases (likely job requirements)
+    for m in _CAPS_PHRASE_RE.finditer(text):
+        phrase = m.group(1).lower()
+        if 3 <= len(phrase) <= 40:
+            yield phrase
+
+    # 4. Meaningful words (4+ chars, not common stopwords); already lowercase
+    for m in _WORD_RE.finditer(text_lower):
+        w = m.group(1)
+        if w not in _STOPWORDS:
+            yield w
+
 
 def extract_keywords(text: str, max_keywords: int = 25) -> list[str]:
     """
@@ -20,45 +50,32 @@ def extract_keywords(text: str, max_keywords: int = 25) -> list[str]:
     """
     if not text or not text.strip():
         return []
-    text_lower = text.lower()
-    seen = set()
-    keywords = []
+    return list(_extract_keywords(text, max_keywords))
 
-    # 1. Add CA Leg terms that appear in the text
-    for term in CA_LEG_KEYWORDS:
-        if term in text_lower and term not in seen:
-            keywords.append(term)
-            seen.add(term)
 
-    # 2. Extract phrases from bullet lines (- item, * item)
-    for m in re.finditer(r"^[\*\-]\s*(.+?)(?:\n|$)", text, re.MULTILINE | re.IGNORECASE):
-        phrase = m.group(1).strip()[:60]
-        # Take first few significant words
-        words = [w for w in re.split(r"\W+", phrase) if len(w) > 2][:5]
-        for w in words:
-            wl = w.lower()
-            if wl not in seen and len(wl) > 2:
-                keywords.append(wl)
-                seen.add(wl)
+@lru_cache(maxsize=16)
+def _extract_keywords(text: str, max_keywords: int) -> tuple[str, ...]:
+    """Memoized body of extract_keywords (a tuple, so cached results can't be mutated)."""
+    text_lower = text.lower()
 
-    # 3. Extract capitalized multi-word phrases (likely job requirements)
-    for m in re.finditer(r"\b([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)\b", text):
-        phrase = m.group(1).lower()
-        if phrase not in seen and 3 <= len(phrase) <= 40:
-            keywords.append(phrase)
-            seen.add(phrase)
+    # 1. Add CA Leg terms that appear in the text (substring match; each `in` is a
+    # C-level fast search, quicker here than one pass through a keyword automaton)
+    # (a dict keeps insertion order and doubles as the seen-set)
+    keywords = dict.fromkeys(term for term in CA_LEG_KEYWORDS if term in text_lower)
 
-    # 4. Meaningful words (4+ chars, not common stopwords)
-    stop = {"that", "this", "with", "from", "have", "will", "your", "they", "when", "what"}
-    for m in re.finditer(r"\b([a-z]{4,})\b", text_lower):
-        w = m.group(1)
-        if w not in seen and w not in stop:
-            keywords.append(w)
-            seen.add(w)
+    # 2-4. Bullet words, capitalized phrases and plain words, deduplicated in one loop;
+    # candidates are generated lazily, so scanning stops once max_keywords is reached
+    if len(keywords) < max_keywords:
+        for kw in _keyword_candidates(text, text_lower):
+            if kw not in keywords:
+                keywords[kw] = None
+                if len(keywords) >= max_keywords:
+                    break
 
-    return keywords[:max_keywords]
+    return tuple(keywords)[:max_keywords]
 
 
+@lru_cache(maxsize=16)
 def build_augmented_query(job_description: str) -> str:
     """Build query that combines full description with extracted keywords for richer semantic match."""
     keywords = extract_keywords(job_description)
@@ -87,21 +104,16 @@ def retrieve_context(
         include_doc_types=include_doc_types,
     )
 
-    chunks_for_preview = [
-        {
-            "content": r["content"],
-            "source": r["metadata"].get("source", "unknown"),
-            "doc_type": r["metadata"].get("doc_type", "unknown"),
-        }
-        for r in results
-    ]
-
-    # Build context string with source labels
+    # Preview rows and the source-labelled context string, built in one pass
+    chunks_for_preview = []
     context_parts = []
-    for i, r in enumerate(results):
-        source = r["metadata"].get("source", "unknown")
-        doc_type = r["metadata"].get("doc_type", "unknown")
-        context_parts.append(f"[Source: {source} ({doc_type})]\n{r['content']}")
+    for r in results:
+        meta = r["metadata"]
+        content = r["content"]
+        source = meta.get("source", "unknown")
+        doc_type = meta.get("doc_type", "unknown")
+        chunks_for_preview.append({"content": content, "source": source, "doc_type": doc_type})
+        context_parts.append(f"[Source: {source} ({doc_type})]\n{content}")
     context = "\n\n---\n\n".join(context_parts)
 
     return context, chunks_for_preview
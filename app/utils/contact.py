@@ -1,76 +1,115 @@
 """Contact info persistence and vCard import."""
-import json
 import re
 from pathlib import Path
 from typing import Optional
 
+import orjson
+
 CONTACT_KEYS = ("my_name", "my_email", "my_phone", "my_address")
 
+_UNFOLD_RE = re.compile(r"\r?\n[ \t]")
+_WS_RE = re.compile(r"\s+")
+
+# (mtime_ns, size) of contact.json -> parsed config, see load_contact_config
+_contact_cache: Optional[tuple[tuple[int, int], dict[str, str]]] = None
+
+
+_CONTACT_CONFIG_PATH = Path(__file__).resolve().parent.parent.parent / "config" / "contact.json"
+
 
 def get_contact_config_path() -> Path:
     """Path to persisted contact config."""
-    return Path(__file__).resolve().parent.parent.parent / "config" / "contact.json"
+    return _CONTACT_CONFIG_PATH
+
+
+def _stat_key(path: Path) -> Optional[tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
 
 def load_contact_config() -> dict[str, str]:
-    """Load saved contact info from config/contact.json."""
+    """Load saved contact info from config/contact.json.
+
+    The parsed file is cached in-process until its mtime/size changes, so repeated
+    calls cost one stat.
+    """
+    global _contact_cache
     path = get_contact_config_path()
-    if not path.exists():
+    key = _stat_key(path)
+    if key is None:
         return {k: "" for k in CONTACT_KEYS}
+    if _contact_cache is not None and _contact_cache[0] == key:
+        return dict(_contact_cache[1])
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return {k: (data.get(k) or "") for k in CONTACT_KEYS}
+        data = orjson.loads(path.read_bytes())
+        config = {k: (data.get(k) or "") for k in CONTACT_KEYS}
     except Exception:
         return {k: "" for k in CONTACT_KEYS}
+    _contact_cache = (key, config)
+    return dict(config)
 
 
 def save_contact_config(data: dict[str, str]) -> None:
     """Save contact info to config/contact.json."""
+    global _contact_cache
     path = get_contact_config_path()
     path.parent.mkdir(parents=True, exist_ok=True)
     out = {k: (data.get(k) or "") for k in CONTACT_KEYS}
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(out, f, indent=2)
+    path.write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+    key = _stat_key(path)
+    _contact_cache = (key, out) if key is not None else None
+
+
+def _format_adr(value: str) -> str:
+    """Format an ADR value (semicolon-separated: ;;;street;city;state;zip;country)."""
+    parts = [p.strip() for p in value.split(";")]
+    try:
+        # Typically: pobox, ext, street, city, region, postal, country
+        _pobox, _ext, street, city, state, zipcode, _country, *_ = parts
+    except ValueError:
+        return "; ".join(filter(None, parts))
+    return ", ".join(filter(None, (street, city, state, zipcode)))
+
+
+# vCard property name -> (result key, value formatter)
+_VCARD_FIELDS = {
+    "FN": ("my_name", str.strip),
+    "TEL": ("my_phone", lambda v: _WS_RE.sub(" ", v.strip())),
+    "EMAIL": ("my_email", str.strip),
+    "ADR": ("my_address", _format_adr),
+}
 
 
 def parse_vcard(vcf_content: str) -> dict[str, str]:
     """
     Parse vCard 3.0/4.0 content. Returns dict with my_name, my_email, my_phone, my_address.
-    Handles folded lines (continuation with space/tab).
+    Handles folded lines (continuation with space/tab). The first non-empty FN, TEL,
+    EMAIL and ADR properties win; parameters (TEL;TYPE=cell) and groups (item1.EMAIL)
+    are ignored.
     """
     result = {k: "" for k in CONTACT_KEYS}
 
     # Unfold lines (RFC 2426: lines ending with CRLF+space continue)
-    text = re.sub(r"\r?\n[ \t]", "", vcf_content)
-
-    # FN = formatted name
-    fn_match = re.search(r"FN:(.+?)(?:\n|$)", text, re.IGNORECASE | re.DOTALL)
-    if fn_match:
-        result["my_name"] = fn_match.group(1).strip()
-
-    # TEL
-    tel_match = re.search(r"TEL[^:]*:(.+?)(?:\n[A-Z]|\n\n|$)", text, re.IGNORECASE | re.DOTALL)
-    if tel_match:
-        result["my_phone"] = re.sub(r"\s+", " ", tel_match.group(1).strip())
-
-    # EMAIL
-    email_match = re.search(r"EMAIL[^:]*:(.+?)(?:\n[A-Z]|\n\n|$)", text, re.IGNORECASE | re.DOTALL)
-    if email_match:
-        result["my_email"] = email_match.group(1).strip()
-
-    # ADR (semicolon-separated: ;;;street;city;state;zip;country)
-    adr_match = re.search(r"ADR[^:]*:(.+?)(?:\n[A-Z]|\n\n|$)", text, re.IGNORECASE | re.DOTALL)
-    if adr_match:
-        parts = [p.strip() for p in adr_match.group(1).split(";")]
-        # Typically: pobox, ext, street, city, region, postal, country
-        if len(parts) >= 7:
-            street = parts[2] or ""
-            city = parts[3] or ""
-            state = parts[4] or ""
-            zipcode = parts[5] or ""
-            result["my_address"] = ", ".join(filter(None, [street, city, state, zipcode]))
-        else:
-            result["my_address"] = "; ".join(filter(None, parts))
+    text = _UNFOLD_RE.sub("", vcf_content)
+
+    # One pass over the content lines, dispatching on the property name
+    remaining = len(_VCARD_FIELDS)
+    for line in text.splitlines():
+        name, sep, value = line.partition(":")
+        if not sep:
+            continue
+        prop = name.split(";", 1)[0].rsplit(".", 1)[-1].strip().upper()
+        field = _VCARD_FIELDS.get(prop)
+        if field is None or result[field[0]]:
+            continue
+        key, fmt = field
+        result[key] = fmt(value)
+        if result[key]:
+            remaining -= 1
+            if not remaining:
+                break
 
     return result
@@ -1,7 +1,9 @@
 """Convert Markdown to styled HTML for PDF export. Uses hardcoded CA Legislature CSS theme."""
 from __future__ import annotations
 
-import markdown
+import re
+import threading
+from pathlib import Path
 
 
 # CA Legislature Resume style — Daily File aesthetic adapted for professional resumes
@@ -193,18 +195,51 @@ CA_LEGISLATURE_CSS = """
 """
 
 
-def md_to_html(md_content: str, title: str = "Document") -> str:
+# One Markdown converter (extensions loaded once), built on first use; Markdown
+# instances keep per-document state, so conversions are serialized on a lock.
+_MD = None
+_MD_LOCK = threading.Lock()
+
+
+def _get_markdown():
+    global _MD
+    if _MD is None:
+        import markdown
+        _MD = markdown.Markdown(extensions=["tables", "fenced_code", "nl2br"], output_format="html5")
+    return _MD
+
+
+# Stylesheet written next to saved HTML files so each file only links to it
+THEME_CSS_FILENAME = "ca-legislature.css"
+_INLINE_STYLE = f"""    <style>
+{CA_LEGISLATURE_CSS}
+    </style>"""
+_LINKED_STYLE = f'    <link rel="stylesheet" href="{THEME_CSS_FILENAME}">'
+
+
+def ensure_theme_css(outputs_dir: Path) -> Path:
+    """Write the theme stylesheet into outputs_dir unless an identical copy is already there."""
+    path = Path(outputs_dir) / THEME_CSS_FILENAME
+    css = CA_LEGISLATURE_CSS.encode("utf-8")
+    try:
+        if path.read_bytes() == css:
+            return path
+    except OSError:
+        pass
+    path.write_bytes(css)
+    return path
+
+
+def md_to_html(md_content: str, title: str = "Document", inline_css: bool = True) -> str:
     """
     Convert Markdown to a full HTML document with embedded CA Legislature CSS.
 
     Uses the basic frame from css-themes-styles: theme wrapper + theme-content div.
-    Suitable for saving and printing to PDF from browser.
+    Suitable for saving and printing to PDF from browser. With inline_css=False the
+    document links THEME_CSS_FILENAME instead (see ensure_theme_css).
     """
-    html_body = markdown.markdown(
-        md_content,
-        extensions=["tables", "fenced_code", "nl2br"],
-        output_format="html5",
-    )
+    with _MD_LOCK:
+        html_body = _get_markdown().reset().convert(md_content)
 
     return f"""<!DOCTYPE html>
 <html lang="en">
@@ -212,9 +247,7 @@ def md_to_html(md_content: str, title: str = "Document") -> str:
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>{_escape_html(title)}</title>
-    <style>
-{CA_LEGISLATURE_CSS}
-    </style>
+{_INLINE_STYLE if inline_css else _LINKED_STYLE}
 </head>
 <body>
     <div class="theme-ca-legislature">
@@ -226,6 +259,14 @@ def md_to_html(md_content: str, title: str = "Document") -> str:
 </html>"""
 
 
+def save_html(html: str, out_path: Path) -> Path:
+    """Write an HTML document as UTF-8 in a single buffered write. Returns out_path."""
+    out_path = Path(out_path)
+    with open(out_path, "wb", buffering=1 << 20) as f:
+        f.write(html.encode("utf-8"))
+    return out_path
+
+
 def _escape_html(s: str) -> str:
     return (
         s.replace("&", "&amp;")
@@ -235,8 +276,16 @@ def _escape_html(s: str) -> str:
     )
 
 
+# Line boundaries str.splitlines() honours besides "\n"
+_OTHER_LINE_BREAKS_RE = re.compile("[\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]")
+
+
 def _indent(html: str, spaces: int = 4) -> str:
     if not html or not html.strip():
         return ""
     prefix = " " * spaces
-    return "\n".join(prefix + line for line in html.strip().splitlines())
+    body = html.strip()
+    if _OTHER_LINE_BREAKS_RE.search(body):
+        return "\n".join(prefix + line for line in body.splitlines())
+    # Common case ("\n" only): one C-level replace instead of a per-line Python loop
+    return prefix + body.replace("\n", "\n" + prefix)